@@ -5,13 +5,41 @@ Chunkers split documents into smaller, retrievable units.
 Chunking strategy significantly impacts retrieval quality.
 """
 
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterator, Optional
 from .loaders import Document
 
 
-@dataclass
+# Sentence boundary: terminal punctuation followed by a whitespace run.
+# Compiled once at import rather than on every document. Leading with a
+# character class (not a lookbehind) lets the regex engine skip straight
+# to candidate punctuation instead of trying a match at every offset.
+_SENT_END_RE = re.compile(r'[.!?]\s+')
+
+
+# Texts at least this long are split lazily in RecursiveChunker. Below it,
+# str.split's single C pass is faster and its list is small enough not to
+# matter; above it, the list would roughly double peak memory.
+_LAZY_SPLIT_MIN_CHARS = 1 << 20
+
+
+def _iter_split(text: str, separator: str) -> Iterator[str]:
+    """Lazy equivalent of text.split(separator) for a non-empty separator."""
+    sep_len = len(separator)
+    find = text.find
+    start = 0
+    while True:
+        end = find(separator, start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + sep_len
+
+
+@dataclass(slots=True)
 class Chunk:
     """
     Represents a chunk of text from a document.
@@ -20,7 +48,9 @@ class Chunk:
         id: Unique identifier for the chunk
         document_id: Parent document ID
         text: Chunk content
-        metadata: Inherited and chunk-specific metadata
+        metadata: Inherited and chunk-specific metadata. Chunkers that add
+            no per-chunk keys share the parent document's dict across all
+            of its chunks; copy it before mutating.
         position: Position in original document (0-indexed)
     """
     id: str
@@ -60,6 +90,15 @@ class Chunker(ABC):
         """
         pass
 
+    def iter_chunks(self, document: Document) -> Iterator[Chunk]:
+        """
+        Yield chunks one at a time.
+
+        Override for streaming chunkers so callers can embed or index
+        chunks without holding the whole list in memory.
+        """
+        yield from self.chunk(document)
+
 
 # =============================================================================
 # Example Implementations
@@ -78,37 +117,43 @@ class FixedSizeChunker(Chunker):
         overlap: int = 50,
         length_function: callable = len
     ):
+        if overlap >= chunk_size:
+            raise ValueError("overlap must be smaller than chunk_size")
         self.chunk_size = chunk_size
         self.overlap = overlap
         self.length_function = length_function
 
     def chunk(self, document: Document) -> list[Chunk]:
+        return list(self.iter_chunks(document))
+
+    def iter_chunks(self, document: Document) -> Iterator[Chunk]:
         text = document.text
-        chunks = []
-        start = 0
-        position = 0
+        size = self.chunk_size
+        doc_id = document.id
+        doc_metadata = document.metadata
+
+        # Window starts are a plain arithmetic progression, so let range()
+        # generate them instead of stepping a cursor by hand.
+        starts = range(0, len(text), size - self.overlap)
 
-        while start < len(text):
-            end = start + self.chunk_size
+        for position, start in enumerate(starts):
+            end = start + size
             chunk_text = text[start:end]
 
-            chunks.append(Chunk(
-                id=f"{document.id}_chunk_{position}",
-                document_id=document.id,
+            # Positional keys vary per chunk, so each chunk needs its own
+            # dict; a single merge is the cheapest way to build it.
+            yield Chunk(
+                id=f"{doc_id}_chunk_{position}",
+                document_id=doc_id,
                 text=chunk_text,
                 metadata={
-                    **document.metadata,
+                    **doc_metadata,
                     'chunk_size': len(chunk_text),
                     'start_char': start,
                     'end_char': end,
                 },
                 position=position
-            ))
-
-            start = end - self.overlap
-            position += 1
-
-        return chunks
+            )
 
 
 class SentenceChunker(Chunker):
@@ -122,38 +167,49 @@ class SentenceChunker(Chunker):
         self.max_chunk_size = max_chunk_size
 
     def chunk(self, document: Document) -> list[Chunk]:
-        sentences = self._split_sentences(document.text)
+        return self._group_sentences(document, self._split_sentences(document.text))
+
+    def _group_sentences(self, document: Document, sentences: list[str]) -> list[Chunk]:
+        """Pack consecutive sentences into chunks of at most max_chunk_size."""
+        max_size = self.max_chunk_size
+        doc_id = document.id
+        metadata = document.metadata
         chunks = []
         current_chunk = []
         current_size = 0
         position = 0
 
+        # Reuse one buffer for the whole document; it is cleared (not
+        # rebound) after each chunk is emitted.
+        append = current_chunk.append
+        emit = chunks.append
+
         for sentence in sentences:
             sentence_len = len(sentence)
 
-            if current_size + sentence_len > self.max_chunk_size and current_chunk:
+            if current_size + sentence_len > max_size and current_chunk:
                 # Save current chunk
-                chunks.append(Chunk(
-                    id=f"{document.id}_chunk_{position}",
-                    document_id=document.id,
+                emit(Chunk(
+                    id=f"{doc_id}_chunk_{position}",
+                    document_id=doc_id,
                     text=' '.join(current_chunk),
-                    metadata=document.metadata,
+                    metadata=metadata,
                     position=position
                 ))
                 position += 1
-                current_chunk = []
+                current_chunk.clear()
                 current_size = 0
 
-            current_chunk.append(sentence)
+            append(sentence)
             current_size += sentence_len
 
         # Don't forget the last chunk
         if current_chunk:
-            chunks.append(Chunk(
-                id=f"{document.id}_chunk_{position}",
-                document_id=document.id,
+            emit(Chunk(
+                id=f"{doc_id}_chunk_{position}",
+                document_id=doc_id,
                 text=' '.join(current_chunk),
-                metadata=document.metadata,
+                metadata=metadata,
                 position=position
             ))
 
@@ -161,9 +217,81 @@ class SentenceChunker(Chunker):
 
     def _split_sentences(self, text: str) -> list[str]:
         """Simple sentence splitting. Use nltk or spacy for better results."""
-        import re
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
+        sentences = []
+        start = 0
+        for match in _SENT_END_RE.finditer(text):
+            # Keep the punctuation, drop the whitespace after it
+            sentence = text[start:match.start() + 1].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+        sentence = text[start:].strip()
+        if sentence:
+            sentences.append(sentence)
+        return sentences
+
+
+class SpacySentenceChunker(SentenceChunker):
+    """
+    Sentence chunker backed by spaCy's rule-based sentencizer.
+
+    Handles abbreviations and quotes better than the regex splitter
+    without loading a statistical model. Use chunk_batch() for bulk
+    ingest: nlp.pipe streams documents through the pipeline in batches
+    and can fan out across processes.
+
+    max_length caps document size in characters (spaCy's own default
+    is 1M); raise it further for very large single documents.
+    """
+
+    def __init__(
+        self,
+        max_chunk_size: int = 512,
+        batch_size: int = 64,
+        n_process: int = 1,
+        max_length: int = 100_000_000
+    ):
+        super().__init__(max_chunk_size)
+        try:
+            from spacy.lang.en import English
+        except ImportError as e:
+            raise ImportError(
+                "SpacySentenceChunker requires spacy: pip install spacy"
+            ) from e
+
+        # Blank pipeline plus sentencizer, built once and reused for
+        # every document
+        self._nlp = English()
+        self._nlp.add_pipe("sentencizer")
+        # spaCy rejects texts over 1M characters to bound the memory of
+        # parser/NER models; the sentencizer alone needs no such guard
+        self._nlp.max_length = max_length
+        self.batch_size = batch_size
+        self.n_process = n_process
+
+    def _split_sentences(self, text: str) -> list[str]:
+        return self._doc_sentences(self._nlp(text))
+
+    @staticmethod
+    def _doc_sentences(doc) -> list[str]:
+        return [s for s in (span.text.strip() for span in doc.sents) if s]
+
+    def chunk_batch(self, documents: list[Document]) -> list[list[Chunk]]:
+        """
+        Chunk many documents in one pipeline pass.
+
+        Returns:
+            One list of chunks per input document, in input order
+        """
+        docs = self._nlp.pipe(
+            (document.text for document in documents),
+            batch_size=self.batch_size,
+            n_process=self.n_process
+        )
+        return [
+            self._group_sentences(document, self._doc_sentences(doc))
+            for document, doc in zip(documents, docs)
+        ]
 
 
 class RecursiveChunker(Chunker):
@@ -186,13 +314,15 @@ class RecursiveChunker(Chunker):
 
     def chunk(self, document: Document) -> list[Chunk]:
         chunks = self._recursive_split(document.text, self.separators)
+        doc_id = document.id
+        metadata = document.metadata
 
         return [
             Chunk(
-                id=f"{document.id}_chunk_{i}",
-                document_id=document.id,
+                id=f"{doc_id}_chunk_{i}",
+                document_id=doc_id,
                 text=chunk_text,
-                metadata=document.metadata,
+                metadata=metadata,
                 position=i
             )
             for i, chunk_text in enumerate(chunks)
@@ -205,40 +335,63 @@ class RecursiveChunker(Chunker):
         separator = separators[0]
         remaining_separators = separators[1:]
 
+        # Fast path: the text already fits, so splitting and re-merging
+        # would rebuild it unchanged. Text that opens with the separator
+        # goes through the merge loop, which drops leading separators.
+        if text and len(text) <= self.chunk_size and not text.startswith(separator):
+            return [text]
+
         if separator == "":
             # Base case: character-level split
             return self._hard_split(text)
 
-        parts = text.split(separator)
+        chunk_size = self.chunk_size
+        sep_len = len(separator)
         chunks = []
-        current = ""
+        # Pieces of the chunk being built; joined once when it is emitted
+        # instead of re-concatenating the growing string per part.
+        buffer = []
+        buffer_len = 0
 
-        for part in parts:
-            candidate = current + (separator if current else "") + part
+        if len(text) >= _LAZY_SPLIT_MIN_CHARS:
+            parts = _iter_split(text, separator)
+        else:
+            parts = text.split(separator)
 
-            if len(candidate) <= self.chunk_size:
-                current = candidate
+        for part in parts:
+            part_len = len(part)
+            candidate_len = buffer_len + (sep_len if buffer_len else 0) + part_len
+
+            if candidate_len <= chunk_size:
+                if buffer_len:
+                    buffer.append(separator)
+                buffer.append(part)
+                buffer_len = candidate_len
             else:
-                if current:
-                    chunks.append(current)
+                if buffer_len:
+                    chunks.append(''.join(buffer))
+                buffer.clear()
                 # Recursively split if part is too large
-                if len(part) > self.chunk_size:
+                if part_len > chunk_size:
                     chunks.extend(self._recursive_split(part, remaining_separators))
-                    current = ""
+                    buffer_len = 0
                 else:
-                    current = part
+                    buffer.append(part)
+                    buffer_len = part_len
 
-        if current:
-            chunks.append(current)
+        if buffer_len:
+            chunks.append(''.join(buffer))
 
         return chunks
 
     def _hard_split(self, text: str) -> list[str]:
         """Last resort: split by character count."""
-        return [
-            text[i:i + self.chunk_size]
-            for i in range(0, len(text), self.chunk_size - self.overlap)
-        ]
+        # Slicing str directly is already a memcpy for ASCII text (CPython
+        # stores it one byte per char); a bytes round-trip only adds an
+        # encode and a decode per chunk.
+        size = self.chunk_size
+        step = size - self.overlap
+        return [text[i:i + size] for i in range(0, len(text), step)]
 
 
 # =============================================================================
@@ -9,6 +9,49 @@ from abc import ABC, abstractmethod
 from typing import Union
 import hashlib
 
+try:
+    import numpy as np
+except ImportError:  # Required by CachedEmbedder only
+    np = None
+
+try:
+    import xxhash
+except ImportError:  # Optional: faster non-cryptographic cache keys
+    xxhash = None
+
+try:
+    from openai import OpenAI
+    _HAS_OPENAI = True
+except ImportError:  # Required by OpenAIEmbedder only
+    _HAS_OPENAI = False
+
+# sentence_transformers is imported in SentenceTransformerEmbedder.__init__
+# rather than here: it pulls in torch, which would add seconds to importing
+# this module for users who never construct a local embedder.
+
+
+def _quantize_int8(vector: "np.ndarray") -> tuple["np.ndarray", float]:
+    """
+    Symmetric int8 quantization: the largest component maps to +/-127.
+
+    Returns the int8 values and the scale that dequantizes them.
+    """
+    max_abs = float(np.max(np.abs(vector))) if vector.size else 0.0
+    scale = max_abs / 127 if max_abs else 1.0
+    return np.round(vector / scale).astype(np.int8), scale
+
+
+def _to_bfloat16(vector: "np.ndarray") -> "np.ndarray":
+    """float32 -> bfloat16 bit patterns (uint16), rounding to nearest even."""
+    bits = np.ascontiguousarray(vector, dtype=np.float32).view(np.uint32)
+    bits = bits + (0x7FFF + ((bits >> 16) & 1))
+    return (bits >> 16).astype(np.uint16)
+
+
+def _from_bfloat16(bits: "np.ndarray") -> "np.ndarray":
+    """bfloat16 bit patterns (uint16) -> float32."""
+    return (bits.astype(np.uint32) << 16).view(np.float32)
+
 
 class Embedder(ABC):
     """
@@ -81,15 +124,23 @@ class OpenAIEmbedder(Embedder):
     Options: text-embedding-3-small, text-embedding-3-large
     """
 
+    MAX_BATCH_SIZE = 2048
+
     def __init__(
         self,
         model: str = "text-embedding-3-small",
         api_key: str = None,
         dimensions: int = None
     ):
+        if not _HAS_OPENAI:
+            raise ImportError("OpenAIEmbedder requires openai: pip install openai")
+
         self.model = model
         self.api_key = api_key
         self._dimensions = dimensions or self._default_dimensions()
+        # One client per embedder: it owns the HTTP connection pool, so
+        # reusing it avoids a fresh TLS handshake on every call.
+        self._client = OpenAI(api_key=api_key)
 
     def _default_dimensions(self) -> int:
         defaults = {
@@ -103,30 +154,24 @@ class OpenAIEmbedder(Embedder):
     def dimension(self) -> int:
         return self._dimensions
 
-    def embed(self, text: str) -> list[float]:
-        # Import here to avoid dependency if not using OpenAI
-        from openai import OpenAI
-
-        client = OpenAI(api_key=self.api_key)
-
-        kwargs = {"model": self.model, "input": text}
+    def _request_kwargs(self, inputs) -> dict:
+        kwargs = {"model": self.model, "input": inputs}
         if self._dimensions and self.model.startswith("text-embedding-3"):
             kwargs["dimensions"] = self._dimensions
+        return kwargs
 
-        response = client.embeddings.create(**kwargs)
+    def embed(self, text: str) -> list[float]:
+        response = self._client.embeddings.create(**self._request_kwargs(text))
         return response.data[0].embedding
 
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=self.api_key)
-
-        kwargs = {"model": self.model, "input": texts}
-        if self._dimensions and self.model.startswith("text-embedding-3"):
-            kwargs["dimensions"] = self._dimensions
-
-        response = client.embeddings.create(**kwargs)
-        return [item.embedding for item in response.data]
+        # The API accepts at most MAX_BATCH_SIZE inputs per request
+        embeddings = []
+        for start in range(0, len(texts), self.MAX_BATCH_SIZE):
+            batch = texts[start:start + self.MAX_BATCH_SIZE]
+            response = self._client.embeddings.create(**self._request_kwargs(batch))
+            embeddings.extend(item.embedding for item in response.data)
+        return embeddings
 
 
 class SentenceTransformerEmbedder(Embedder):
@@ -137,22 +182,45 @@ class SentenceTransformerEmbedder(Embedder):
     Options: all-MiniLM-L6-v2, all-mpnet-base-v2, multilingual models
     """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
-        from sentence_transformers import SentenceTransformer
-        self.model = SentenceTransformer(model_name)
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        device: str = None,
+        batch_size: int = 64,
+        normalize_embeddings: bool = False
+    ):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "SentenceTransformerEmbedder requires sentence-transformers: "
+                "pip install sentence-transformers"
+            ) from e
+        self.model = SentenceTransformer(model_name, device=device)
+        self.batch_size = batch_size
+        self.normalize_embeddings = normalize_embeddings
         self._dimension = self.model.get_sentence_embedding_dimension()
 
     @property
     def dimension(self) -> int:
         return self._dimension
 
+    def _encode(self, texts):
+        # encode() already length-sorts inputs before batching to minimise
+        # padding, so there is no need to pre-sort here.
+        return self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=self.normalize_embeddings,
+            show_progress_bar=False
+        )
+
     def embed(self, text: str) -> list[float]:
-        embedding = self.model.encode(text)
-        return embedding.tolist()
+        return self._encode(text).tolist()
 
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        embeddings = self.model.encode(texts)
-        return embeddings.tolist()
+        return self._encode(texts).tolist()
 
 
 class CachedEmbedder(Embedder):
@@ -160,51 +228,130 @@ class CachedEmbedder(Embedder):
     Wrapper that adds caching to any embedder.
 
     Reduces API costs and latency for repeated texts.
+
+    Cached vectors are stored as read-only float32 arrays (4 bytes per
+    dimension instead of a boxed Python float each). Use embed_ndarray()
+    to read them without converting back to a list. Results are always
+    read back from the cached form, so even a cache miss returns the
+    base embedder's values rounded to the cache precision, and a miss
+    and a later hit for the same text agree exactly.
+
+    AGENT_ZONE: Choose cache precision
+    Options: fp32 (float32-rounded), bf16 (2x smaller), int8 (4x smaller)
+    Validate recall on your golden set before going below fp32.
     """
 
-    def __init__(self, base_embedder: Embedder, cache: dict = None):
+    QUANTIZATIONS = ("fp32", "bf16", "int8")
+
+    def __init__(
+        self,
+        base_embedder: Embedder,
+        cache: dict = None,
+        quantization: str = "fp32"
+    ):
+        if np is None:
+            raise ImportError("CachedEmbedder requires numpy: pip install numpy")
+        if quantization not in self.QUANTIZATIONS:
+            raise ValueError(
+                f"quantization must be one of {self.QUANTIZATIONS}, got {quantization!r}"
+            )
         self.base_embedder = base_embedder
         self.cache = cache if cache is not None else {}
+        self.quantization = quantization
 
     @property
     def dimension(self) -> int:
         return self.base_embedder.dimension
 
     def _cache_key(self, text: str) -> str:
-        return hashlib.sha256(text.encode()).hexdigest()
+        # Cache keys only need to be collision-resistant, not
+        # cryptographic. xxh3 is used when installed, otherwise BLAKE2b
+        # (stdlib, faster than SHA-256 without SHA-NI). Keys are not
+        # portable between the two, so pin xxhash on every host sharing
+        # an external cache.
+        data = text.encode()
+        if xxhash is not None:
+            return xxhash.xxh3_128_hexdigest(data)
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def _encode(self, embedding):
+        """Convert an embedding to its cached representation."""
+        vector = np.asarray(embedding, dtype=np.float32)
+
+        if self.quantization == "int8":
+            stored, scale = _quantize_int8(vector)
+            stored.flags.writeable = False
+            return stored, scale
+
+        if self.quantization == "bf16":
+            stored = _to_bfloat16(vector)
+        else:
+            stored = vector.copy()
+
+        stored.flags.writeable = False
+        return stored
+
+    def _decode(self, stored) -> "np.ndarray":
+        """Convert a cached entry back to a float32 vector."""
+        # Dispatch on the stored form, not self.quantization, so a shared
+        # cache written at a different precision stays readable.
+        if isinstance(stored, tuple):
+            values, scale = stored
+            return values.astype(np.float32) * np.float32(scale)
+        if isinstance(stored, np.ndarray) and stored.dtype == np.uint16:
+            return _from_bfloat16(stored)
+        # asarray is a no-op for fp32 entries and still accepts plain
+        # lists from pre-populated or external caches.
+        return np.asarray(stored, dtype=np.float32)
+
+    def embed_ndarray(self, text: str) -> "np.ndarray":
+        """
+        Generate embedding for a single text as a float32 array.
 
-    def embed(self, text: str) -> list[float]:
+        The returned array may be a read-only view of the cache entry; do
+        not mutate it.
+        """
         key = self._cache_key(text)
 
-        if key in self.cache:
-            return self.cache[key]
+        # One probe per lookup: `in` followed by `[]` hashes and searches
+        # twice, which for a remote cache means two round-trips.
+        stored = self.cache.get(key)
+        if stored is not None:
+            return self._decode(stored)
 
-        embedding = self.base_embedder.embed(text)
-        self.cache[key] = embedding
-        return embedding
+        stored = self._encode(self.base_embedder.embed(text))
+        self.cache[key] = stored
+        return self._decode(stored)
+
+    def embed(self, text: str) -> list[float]:
+        return self.embed_ndarray(text).tolist()
 
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        results = []
-        uncached_texts = []
-        uncached_indices = []
+        results = [None] * len(texts)
+        # Cache key -> positions in texts still needing an embedding
+        pending: dict[str, list[int]] = {}
 
         # Check cache
         for i, text in enumerate(texts):
             key = self._cache_key(text)
-            if key in self.cache:
-                results.append(self.cache[key])
+            stored = self.cache.get(key)
+            if stored is not None:
+                results[i] = self._decode(stored).tolist()
+            elif key in pending:
+                pending[key].append(i)
             else:
-                results.append(None)
-                uncached_texts.append(text)
-                uncached_indices.append(i)
-
-        # Embed uncached
-        if uncached_texts:
-            new_embeddings = self.base_embedder.embed_batch(uncached_texts)
-            for idx, text, embedding in zip(uncached_indices, uncached_texts, new_embeddings):
-                key = self._cache_key(text)
-                self.cache[key] = embedding
-                results[idx] = embedding
+                pending[key] = [i]
+
+        # Embed uncached, each distinct text once
+        if pending:
+            unique_texts = [texts[positions[0]] for positions in pending.values()]
+            new_embeddings = self.base_embedder.embed_batch(unique_texts)
+            for (key, positions), embedding in zip(pending.items(), new_embeddings):
+                stored = self._encode(embedding)
+                self.cache[key] = stored
+                vector = self._decode(stored)
+                for idx in positions:
+                    results[idx] = vector.tolist()
 
         return results
 
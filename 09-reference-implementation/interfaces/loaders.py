@@ -11,7 +11,7 @@ from datetime import datetime
 from typing import Any, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Document:
     """
     Represents a loaded document.
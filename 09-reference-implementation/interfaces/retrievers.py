@@ -4,13 +4,173 @@ Retrieval Interface
 Retrievers store and search vector embeddings to find relevant chunks.
 """
 
+import hashlib
+import heapq
+import json
+import math
+import os
+import threading
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
 from .chunkers import Chunk
+from .embedders import _from_bfloat16, _quantize_int8, _to_bfloat16
 
+try:
+    import numpy as np
+except ImportError:  # Required by the in-process retrievers only
+    np = None
 
-@dataclass
+try:
+    import simsimd
+except ImportError:  # Optional: fused SIMD similarity kernels
+    simsimd = None
+
+try:
+    import numba
+except ImportError:  # Optional: compiled scoring loop for quantized rows
+    numba = None
+
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _dot_rows(matrix, query_vec, out):
+        # Explicit loops rather than np.dot so LLVM can vectorise the
+        # inner product for any row dtype; prange splits rows over cores
+        for i in numba.prange(matrix.shape[0]):
+            acc = 0.0
+            for j in range(matrix.shape[1]):
+                acc += matrix[i, j] * query_vec[j]
+            out[i] = acc
+
+
+def _matches_filters(chunk: Chunk, filters: dict) -> bool:
+    """Exact-match metadata filter shared by the in-process retrievers."""
+    for key, value in filters.items():
+        if chunk.metadata.get(key) != value:
+            return False
+    return True
+
+
+def normalize_inplace(v: "np.ndarray") -> "np.ndarray":
+    """Scale a float vector to unit L2 length in place; zero vectors stay zero."""
+    norm = np.linalg.norm(v)
+    if norm:
+        v /= norm
+    return v
+
+
+def _row_norms(matrix: "np.ndarray") -> "np.ndarray":
+    """L2 norm of each stored row, in the units its dot products use."""
+    if matrix.dtype == np.uint16:
+        matrix = _from_bfloat16(matrix)
+    return np.linalg.norm(matrix, axis=-1)
+
+
+# Rows widened to float32 per step when scoring bfloat16 without SimSIMD;
+# bounds the temporary copy to a few MB instead of the whole matrix
+_BF16_BLOCK_ROWS = 4096
+
+
+def _cosine_scores(
+    matrix: "np.ndarray",
+    norms: Optional["np.ndarray"],
+    query_vec: "np.ndarray"
+) -> "np.ndarray":
+    """
+    Cosine similarity between each row of `matrix` and `query_vec`.
+
+    `norms` holds the rows' L2 norms, computed once at index time, so a
+    query only pays for the dot products. None means the rows and the
+    query are unit length, and the dot products are returned as is.
+    """
+    if simsimd is not None:
+        kwargs = {}
+        # SimSIMD compares like with like: int8 kernels use VNNI, bf16
+        # kernels use AVX-512 BF16 where the CPU has it
+        if matrix.dtype == np.int8:
+            query_vec, _ = _quantize_int8(query_vec)
+        elif matrix.dtype == np.uint16:
+            query_vec = _to_bfloat16(query_vec)
+            kwargs["dtype"] = "bf16"
+        dots = np.asarray(
+            simsimd.cdist(query_vec[np.newaxis, :], matrix, metric="dot", **kwargs)
+        ).ravel()
+        if matrix.dtype == np.uint16:
+            # The query was rounded too; score against its rounded norm
+            query_vec = _from_bfloat16(query_vec)
+    elif matrix.dtype == np.uint16:
+        dots = np.empty(matrix.shape[0], dtype=np.float32)
+        for start in range(0, matrix.shape[0], _BF16_BLOCK_ROWS):
+            block = matrix[start:start + _BF16_BLOCK_ROWS]
+            dots[start:start + block.shape[0]] = _from_bfloat16(block) @ query_vec
+    elif numba is not None and matrix.dtype == np.int8:
+        # NumPy would first copy a quantized matrix to float32 in full;
+        # the compiled loop converts one element at a time instead
+        dots = np.empty(matrix.shape[0], dtype=np.float32)
+        _dot_rows(matrix, query_vec, dots)
+    else:
+        dots = matrix @ query_vec
+    if norms is None:
+        return dots
+    # Zero rows or a zero query score 0, as unit-length float32 rows do
+    denom = norms * np.linalg.norm(query_vec)
+    scores = np.zeros(dots.shape, dtype=np.float32)
+    np.divide(dots, denom, out=scores, where=denom != 0)
+    return scores
+
+
+class _QueryCache:
+    """Thread-safe LRU cache of search results with an optional TTL."""
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()  # key -> (results, stored_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            results, stored_at = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return results
+
+    def put(self, key, results) -> None:
+        with self._lock:
+            self._entries[key] = (results, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _query_cache_key(query_embedding, top_k: int, filters: Optional[dict]):
+    """Cache key for a search, or None if the filters are unhashable."""
+    try:
+        filter_key = frozenset((filters or {}).items())
+    except TypeError:
+        return None
+    # Rounding to 3 decimals lets near-identical queries share an entry
+    if np is not None:
+        query_key = np.round(np.asarray(query_embedding, dtype=np.float32), 3).tobytes()
+    else:
+        query_key = tuple(round(x, 3) for x in query_embedding)
+    return query_key, top_k, filter_key
+
+
+@dataclass(slots=True)
 class SearchResult:
     """
     Represents a search result.
@@ -36,6 +196,9 @@ class Retriever(ABC):
     - pgvector
     - Chroma
 
+    Scores follow SearchResult: higher is more similar. Their scale is
+    up to the implementation (cosine, reranker or fused scores).
+
     AGENT_ZONE: Implement for your vector database choice
     See: 04-retrieval/vector-search.md
     """
@@ -71,6 +234,15 @@ class Retriever(ABC):
         """
         pass
 
+    def index_batch(self, chunks: list[Chunk], embeddings: list[list[float]]) -> None:
+        """
+        Index multiple chunks with their embeddings.
+
+        Override for optimized bulk writes.
+        """
+        for chunk, embedding in zip(chunks, embeddings):
+            self.index(chunk, embedding)
+
     def delete(self, chunk_id: str) -> None:
         """Delete a chunk from the index."""
         raise NotImplementedError
@@ -120,18 +292,342 @@ class HybridRetriever(Retriever):
 
 class InMemoryRetriever(Retriever):
     """
-    Simple in-memory retriever for testing and small datasets.
-
-    Not suitable for production - use for prototyping only.
+    Exact (brute-force) retriever running in-process.
+
+    Fine for prototyping and tests as is. For production use on a
+    single host (up to a few million chunks), set path for persistence
+    shared across worker processes, a compact dtype to cut memory, and
+    num_threads to use every core. There is no replication and only one
+    writer; past that, use a vector database, or HNSWRetriever where
+    approximate search is acceptable.
+
+    Scores are cosine similarities. Embeddings live in one contiguous
+    matrix, so a query is scored against every chunk with a single
+    matrix-vector product. float32 rows are L2-normalized when indexed,
+    making that product the cosine itself, so stored vectors do not keep
+    their magnitude; quantized rows keep a per-row norm instead.
+
+    With `path`, the matrix is a memory-mapped .npy file in that
+    directory and chunks are kept in a JSON sidecar (metadata must be
+    JSON-serialisable). Reopening the directory restores the index
+    without re-embedding, and read_only=True lets forked workers share
+    the page cache. Call save() or close() to persist changes; until
+    then a reopen sees the last saved state. Rows the sidecar maps are
+    never rewritten between saves: deleting or re-indexing a saved
+    chunk marks its row dead (re-indexed vectors are appended), and
+    save() compacts the dead rows away.
+
+    cache_size > 0 keeps an LRU cache of recent search results, cleared
+    on every write.
+
+    num_threads > 1 splits scoring of large matrices into row shards
+    scored on a thread pool; NumPy and SimSIMD release the GIL, so the
+    shards run on separate cores.
+
+    AGENT_ZONE: Choose storage precision
+    Options: float32 (exact), bfloat16 (2x smaller, near-exact),
+             int8 (4x smaller, small recall loss)
     """
 
-    def __init__(self):
-        self.chunks: dict[str, Chunk] = {}
-        self.embeddings: dict[str, list[float]] = {}
+    DTYPES = ("float32", "bfloat16", "int8")
+    VECTORS_FILE = "vectors.npy"
+    CHUNKS_FILE = "chunks.json"
+    # Below this many candidate rows, thread dispatch costs more than
+    # it saves
+    PARALLEL_MIN_ROWS = 16384
+
+    def __init__(
+        self,
+        dtype: str = "float32",
+        path: Optional[str] = None,
+        read_only: bool = False,
+        cache_size: int = 0,
+        cache_ttl: Optional[float] = None,
+        num_threads: int = 1
+    ):
+        if np is None:
+            raise ImportError("InMemoryRetriever requires numpy: pip install numpy")
+        if dtype not in self.DTYPES:
+            raise ValueError(f"dtype must be one of {self.DTYPES}, got {dtype!r}")
+        self.dtype = dtype
+        self.path = path
+        self.read_only = read_only
+        # Row-aligned columns: row i of the matrix belongs to _ids[i] and
+        # _chunks[i], so search results need no per-candidate hashing
+        self._ids: list[Optional[str]] = []        # row -> chunk id
+        self._chunks: list[Optional[Chunk]] = []   # row -> chunk
+        self._rows: dict[str, int] = {}  # chunk id -> row
+        # [capacity, dim]; rows from len(self._ids) on are unused
+        self._matrix = None
+        # L2 norm of each matrix row, so search() need not recompute them
+        self._norms = None
+        # float32 rows are stored unit-length and scored without _norms
+        self._unit_rows = dtype == "float32"
+        # Inverted index over metadata: key -> value -> chunk ids. Ids
+        # rather than rows, since delete() moves rows around.
+        self._postings: dict[str, dict[Any, set[str]]] = {}
+        # Rows the JSON sidecar maps to chunk ids, as of the last save().
+        # They stay untouched on disk until the next save(); rows vacated
+        # meanwhile are dead (None in _ids/_chunks) and skipped by search.
+        self._saved_rows = 0
+        self._dead: set[int] = set()
+        self._cache = _QueryCache(cache_size, cache_ttl) if cache_size else None
+        self.num_threads = num_threads
+        self._executor = ThreadPoolExecutor(num_threads) if num_threads > 1 else None
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            if os.path.exists(os.path.join(path, self.CHUNKS_FILE)):
+                self._load()
+
+    def _load(self) -> None:
+        """Reopen a persisted index from self.path."""
+        matrix = np.load(
+            os.path.join(self.path, self.VECTORS_FILE),
+            mmap_mode="r" if self.read_only else "r+"
+        )
+        if matrix.dtype != self._storage_dtype:
+            raise ValueError(
+                f"{self.path} stores {matrix.dtype} vectors, not {self.dtype}"
+            )
+        with open(os.path.join(self.path, self.CHUNKS_FILE), encoding="utf-8") as f:
+            records = json.load(f)
+
+        # Rows past the sidecar's length were appended after the last
+        # save() and are ignored
+        n = len(records)
+        self._saved_rows = n
+        self._matrix = matrix
+        self._norms = np.empty(matrix.shape[0], dtype=np.float32)
+        self._norms[:n] = _row_norms(matrix[:n])
+        if self._unit_rows:
+            # Files written before rows were normalized score through norms
+            live = self._norms[:n]
+            self._unit_rows = bool(np.all((np.abs(live - 1) < 1e-3) | (live == 0)))
+        for row, record in enumerate(records):
+            chunk = Chunk(**record)
+            self._ids.append(chunk.id)
+            self._chunks.append(chunk)
+            self._rows[chunk.id] = row
+            self._post(chunk)
+
+    def save(self) -> None:
+        """Flush vectors and write the chunk sidecar (persistent mode only)."""
+        if self.path is None or self.read_only or self._matrix is None:
+            return
+        self._compact()
+        self._matrix.flush()
+        records = [asdict(chunk) for chunk in self._chunks]
+        target = os.path.join(self.path, self.CHUNKS_FILE)
+        with open(target + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(records, f)
+        os.replace(target + ".tmp", target)
+        self._saved_rows = len(records)
+
+    def _compact(self) -> None:
+        """Fill dead rows with live rows from the tail, then drop the tail."""
+        last = len(self._ids) - 1
+        for hole in sorted(self._dead):
+            while last > hole and last in self._dead:
+                last -= 1
+            if last <= hole:
+                break
+            self._move_row(last, hole)
+            last -= 1
+        size = len(self._ids) - len(self._dead)
+        del self._ids[size:]
+        del self._chunks[size:]
+        self._dead.clear()
+
+    def _move_row(self, src: int, dst: int) -> None:
+        """Move the live row `src` into the free row `dst`."""
+        chunk_id = self._ids[src]
+        self._matrix[dst] = self._matrix[src]
+        self._norms[dst] = self._norms[src]
+        self._ids[dst] = chunk_id
+        self._chunks[dst] = self._chunks[src]
+        self._rows[chunk_id] = dst
+
+    @property
+    def chunks(self) -> dict[str, Chunk]:
+        """Indexed chunks by id (a snapshot built on each access)."""
+        return {
+            chunk_id: chunk
+            for chunk_id, chunk in zip(self._ids, self._chunks)
+            if chunk_id is not None
+        }
+
+    @property
+    def _storage_dtype(self) -> "np.dtype":
+        # bfloat16 has no NumPy dtype; rows hold its uint16 bit patterns
+        if self.dtype == "bfloat16":
+            return np.dtype(np.uint16)
+        return np.dtype(self.dtype)
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise ValueError(f"index at {self.path} was opened read-only")
+        if self._cache is not None:
+            self._cache.clear()
+
+    def close(self) -> None:
+        """Persist and release the memory map and scoring threads."""
+        self.save()
+        self._matrix = None
+        self._norms = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
     def index(self, chunk: Chunk, embedding: list[float]) -> None:
-        self.chunks[chunk.id] = chunk
-        self.embeddings[chunk.id] = embedding
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self._unit_rows:
+            # Copy first: asarray may return the caller's own array
+            vector = normalize_inplace(vector.copy())
+        elif self.dtype == "int8":
+            # Per-vector scale is not stored: cosine similarity is
+            # invariant to it, so the int8 row scores like its
+            # dequantized form.
+            vector, _ = _quantize_int8(vector)
+        elif self.dtype == "bfloat16":
+            vector = _to_bfloat16(vector)
+        self._check_writable()
+        # Check explicitly: assigning into a matrix row would broadcast a
+        # length-1 embedding across the whole row
+        if vector.ndim != 1 or (
+            self._matrix is not None and vector.shape != self._matrix.shape[1:]
+        ):
+            dim = "?" if self._matrix is None else self._matrix.shape[1]
+            raise ValueError(
+                f"embedding has shape {vector.shape}, expected ({dim},)"
+            )
+        row = self._rows.get(chunk.id)
+
+        if row is not None and row < self._saved_rows:
+            # The sidecar maps this row; leave it for save() to reclaim
+            # and append the new vector instead
+            self._unpost(self._chunks[row])
+            self._kill_row(row)
+            row = None
+        if row is None:
+            row = len(self._ids)
+            self._reserve(row + 1, vector.shape[0])
+
+        self._matrix[row] = vector
+        self._norms[row] = _row_norms(vector)
+        if row == len(self._ids):
+            self._ids.append(chunk.id)
+            self._chunks.append(chunk)
+            self._rows[chunk.id] = row
+        else:
+            self._unpost(self._chunks[row])
+            self._chunks[row] = chunk
+        self._post(chunk)
+
+    def _kill_row(self, row: int) -> None:
+        """Mark a saved row dead without touching the file."""
+        self._ids[row] = None
+        self._chunks[row] = None
+        self._dead.add(row)
+
+    def _post(self, chunk: Chunk) -> None:
+        """Add a chunk's metadata to the inverted index."""
+        for key, value in chunk.metadata.items():
+            try:
+                self._postings.setdefault(key, {}).setdefault(value, set()).add(chunk.id)
+            except TypeError:
+                # Unhashable values (lists, dicts) are left out; no
+                # hashable filter value can equal them anyway
+                pass
+
+    def _unpost(self, chunk: Chunk) -> None:
+        """Remove a chunk's metadata from the inverted index."""
+        for key, value in chunk.metadata.items():
+            try:
+                ids = self._postings[key][value]
+            except (KeyError, TypeError):
+                continue
+            ids.discard(chunk.id)
+            if not ids:
+                del self._postings[key][value]
+
+    def _filter_rows(self, filters: dict) -> "np.ndarray":
+        """Sorted matrix rows of chunks matching every filter."""
+        try:
+            postings = [
+                self._postings.get(key, {}).get(value, ())
+                for key, value in filters.items()
+                if value is not None
+            ]
+            unindexed = len(postings) < len(filters)
+        except TypeError:
+            unindexed = True
+
+        if unindexed:
+            # None also matches chunks missing the key, and unhashable
+            # filter values cannot be looked up: fall back to a scan
+            return np.flatnonzero(np.fromiter(
+                (
+                    chunk is not None and _matches_filters(chunk, filters)
+                    for chunk in self._chunks
+                ),
+                dtype=bool,
+                count=len(self._ids)
+            ))
+
+        # Intersect starting from the most selective filter
+        postings.sort(key=len)
+        matched = set(postings[0]).intersection(*postings[1:])
+        rows = np.fromiter(
+            (self._rows[chunk_id] for chunk_id in matched),
+            dtype=np.intp,
+            count=len(matched)
+        )
+        # Row order keeps score ties ranked the same as unfiltered search
+        rows.sort()
+        return rows
+
+    def _reserve(self, size: int, dim: int) -> None:
+        """Ensure the matrix has room for `size` rows."""
+        if self._matrix is None:
+            capacity = max(size, 16)
+            self._matrix = self._allocate(capacity, dim)
+            self._norms = np.empty(capacity, dtype=np.float32)
+        elif size > self._matrix.shape[0]:
+            # Double capacity so appends stay amortised O(1)
+            capacity = max(size, 2 * self._matrix.shape[0])
+            # Persistent indexes grow into a temporary file that replaces
+            # the old one once rows are copied, so a crash mid-resize
+            # leaves the previous file intact
+            grown = self._allocate(capacity, dim, self.VECTORS_FILE + ".tmp")
+            grown_norms = np.empty(capacity, dtype=np.float32)
+            live = len(self._ids)
+            grown[:live] = self._matrix[:live]
+            grown_norms[:live] = self._norms[:live]
+            self._matrix = grown
+            self._norms = grown_norms
+            if self.path is not None:
+                grown.flush()
+                os.replace(
+                    os.path.join(self.path, self.VECTORS_FILE + ".tmp"),
+                    os.path.join(self.path, self.VECTORS_FILE)
+                )
+
+    def _allocate(
+        self,
+        capacity: int,
+        dim: int,
+        filename: str = VECTORS_FILE
+    ) -> "np.ndarray":
+        """Allocate an uninitialised [capacity, dim] matrix."""
+        if self.path is None:
+            return np.empty((capacity, dim), dtype=self._storage_dtype)
+        return np.lib.format.open_memmap(
+            os.path.join(self.path, filename),
+            mode="w+",
+            dtype=self._storage_dtype,
+            shape=(capacity, dim)
+        )
 
     def search(
         self,
@@ -139,69 +635,363 @@ class InMemoryRetriever(Retriever):
         top_k: int = 5,
         filters: Optional[dict] = None
     ) -> list[SearchResult]:
-        import numpy as np
+        key = None
+        if self._cache is not None:
+            key = _query_cache_key(query_embedding, top_k, filters)
+            cached = self._cache.get(key) if key is not None else None
+            if cached is not None:
+                return list(cached)
+
+        results = self._search(query_embedding, top_k, filters)
+        if key is not None:
+            self._cache.put(key, results)
+        return list(results)
+
+    def _search(
+        self,
+        query_embedding: list[float],
+        top_k: int,
+        filters: Optional[dict]
+    ) -> list[SearchResult]:
+        n = len(self._ids)
+        if n == 0 or top_k <= 0:
+            return []
+
+        query_vec = np.array(query_embedding, dtype=np.float32)
+        matrix = self._matrix[:n]
+        norms = self._norms[:n]
+        if self._unit_rows:
+            normalize_inplace(query_vec)
+            norms = None
+
+        # Apply filters before scoring so excluded chunks cost nothing
+        if filters:
+            rows = self._filter_rows(filters)
+            if rows.size == 0:
+                return []
+            matrix = matrix[rows]
+            if norms is not None:
+                norms = norms[rows]
+        else:
+            rows = np.arange(n)
+
+        # Calculate cosine similarity for all candidates in one pass
+        scores = self._score(matrix, norms, query_vec)
+        live = scores.size
+        if self._dead and not filters:
+            # Filtered rows come from postings, which hold live ids only
+            scores = np.array(scores, dtype=np.float32)
+            scores[list(self._dead)] = -np.inf
+            live -= len(self._dead)
+
+        # Select the top k in O(N) with a partition, then sort only those
+        k = min(top_k, live)
+        if k <= 0:
+            return []
+        if k < scores.size:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(scores.size)
+        # Sort by similarity; ties keep index order
+        order = top[np.lexsort((top, -scores[top]))]
 
-        query_vec = np.array(query_embedding)
-        scores = []
+        return [
+            SearchResult(
+                chunk=self._chunks[rows[i]],
+                score=float(scores[i]),
+                rank=rank + 1
+            )
+            for rank, i in enumerate(order)
+        ]
 
-        for chunk_id, embedding in self.embeddings.items():
-            chunk = self.chunks[chunk_id]
+    def _score(
+        self,
+        matrix: "np.ndarray",
+        norms: Optional["np.ndarray"],
+        query_vec: "np.ndarray"
+    ) -> "np.ndarray":
+        """Cosine scores for `matrix`, sharded over the thread pool if large."""
+        n = matrix.shape[0]
+        # The Numba kernel already spreads rows over cores itself
+        numba_path = simsimd is None and numba is not None and matrix.dtype == np.int8
+        if self._executor is None or n < self.PARALLEL_MIN_ROWS or numba_path:
+            return _cosine_scores(matrix, norms, query_vec)
+
+        bounds = np.linspace(0, n, min(self.num_threads, n) + 1, dtype=np.intp)
+        return np.concatenate(list(self._executor.map(
+            lambda lo, hi: _cosine_scores(
+                matrix[lo:hi], None if norms is None else norms[lo:hi], query_vec
+            ),
+            bounds[:-1],
+            bounds[1:]
+        )))
 
-            # Apply filters
-            if filters and not self._matches_filters(chunk, filters):
-                continue
+    def delete(self, chunk_id: str) -> None:
+        self._check_writable()
+        row = self._rows.pop(chunk_id, None)
+        if row is None:
+            return
+        self._unpost(self._chunks[row])
+
+        if row < self._saved_rows:
+            self._kill_row(row)
+            return
+        # Move the last row into the gap so live rows stay contiguous;
+        # both rows lie past the saved ones, so the sidecar is unaffected
+        last = len(self._ids) - 1
+        if row != last:
+            self._move_row(last, row)
+        self._ids.pop()
+        self._chunks.pop()
+
+
+class HNSWRetriever(Retriever):
+    """
+    Approximate nearest-neighbour retriever backed by an hnswlib graph.
 
-            # Calculate cosine similarity
-            doc_vec = np.array(embedding)
-            similarity = np.dot(query_vec, doc_vec) / (
-                np.linalg.norm(query_vec) * np.linalg.norm(doc_vec)
-            )
-            scores.append((chunk, similarity))
+    Queries walk a layered small-world graph and touch O(log N) vectors
+    instead of scanning all of them, trading exactness for latency.
+    Filters are evaluated during the graph walk; a filter matching fewer
+    than top_k chunks returns only the matches.
 
-        # Sort by similarity
-        scores.sort(key=lambda x: x[1], reverse=True)
+    AGENT_ZONE: Tune graph parameters
+    Options: M / ef_construction (build quality), ef_search (recall vs latency)
+    See: 04-retrieval/vector-search.md
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        max_elements: int = 10_000,
+        M: int = 16,
+        ef_construction: int = 64,
+        ef_search: int = 40,
+        metric: str = "cosine"
+    ):
+        import hnswlib
+
+        if np is None:
+            raise ImportError("HNSWRetriever requires numpy: pip install numpy")
+
+        self.metric = metric
+        self._index = hnswlib.Index(space=metric, dim=dimension)
+        self._index.init_index(
+            max_elements=max_elements,
+            M=M,
+            ef_construction=ef_construction,
+            allow_replace_deleted=True
+        )
+        self._index.set_ef(ef_search)
+
+        # hnswlib identifies vectors by integer label
+        self.chunks: dict[str, Chunk] = {}
+        self._labels: dict[str, int] = {}  # chunk id -> label
+        self._ids: dict[int, str] = {}     # label -> chunk id
+        self._next_label = 0
+
+    def index(self, chunk: Chunk, embedding: list[float]) -> None:
+        label = self._labels.get(chunk.id)
+        is_new = label is None
+
+        if is_new:
+            if len(self._labels) >= self._index.get_max_elements():
+                self.resize_index(2 * self._index.get_max_elements())
+            label = self._next_label
+            self._next_label += 1
+            self._labels[chunk.id] = label
+            self._ids[label] = chunk.id
+
+        # New labels may take the slot of a deleted one. An existing label
+        # must not: hnswlib would move it to the free slot and leave its
+        # old vector live, so it is updated in place instead.
+        self._index.add_items(
+            np.asarray([embedding], dtype=np.float32),
+            [label],
+            replace_deleted=is_new
+        )
+        self.chunks[chunk.id] = chunk
+
+    def resize_index(self, max_elements: int) -> None:
+        """Grow the graph's capacity (it is fixed at construction)."""
+        self._index.resize_index(max_elements)
+
+    def search(
+        self,
+        query_embedding: list[float],
+        top_k: int = 5,
+        filters: Optional[dict] = None
+    ) -> list[SearchResult]:
+        k = min(top_k, len(self._labels))
+        if k <= 0:
+            return []
+
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        label_filter = None
+        if filters:
+            def matches(label):
+                return _matches_filters(self.chunks[self._ids[label]], filters)
+            label_filter = matches
+
+        try:
+            labels, distances = self._index.knn_query(query_vec, k=k, filter=label_filter)
+        except RuntimeError:
+            # hnswlib cannot return fewer than k hits. Only a filter
+            # matching fewer than k chunks gets here, so count the
+            # matches and ask for exactly that many.
+            if label_filter is None:
+                raise
+            k = sum(1 for label in self._ids if label_filter(label))
+            if k == 0:
+                return []
+            labels, distances = self._index.knn_query(query_vec, k=k, filter=label_filter)
 
         return [
-            SearchResult(chunk=chunk, score=score, rank=i + 1)
-            for i, (chunk, score) in enumerate(scores[:top_k])
+            SearchResult(
+                chunk=self.chunks[self._ids[int(label)]],
+                score=self._to_score(float(distance)),
+                rank=i + 1
+            )
+            for i, (label, distance) in enumerate(zip(labels[0], distances[0]))
         ]
 
-    def _matches_filters(self, chunk: Chunk, filters: dict) -> bool:
-        for key, value in filters.items():
-            if chunk.metadata.get(key) != value:
-                return False
-        return True
+    def _to_score(self, distance: float) -> float:
+        # hnswlib reports 1 - similarity for cosine/ip and squared L2
+        # otherwise; flip to "higher is more similar"
+        if self.metric in ("cosine", "ip"):
+            return 1.0 - distance
+        return -distance
 
     def delete(self, chunk_id: str) -> None:
         self.chunks.pop(chunk_id, None)
-        self.embeddings.pop(chunk_id, None)
+        label = self._labels.pop(chunk_id, None)
+        if label is None:
+            return
+        del self._ids[label]
+        self._index.mark_deleted(label)
+
+
+# Pinecone clients and index handles shared by every PineconeRetriever in
+# the process, so workers reuse one connection pool (and its TLS sessions)
+# per index instead of opening their own
+_PINECONE_CLIENTS: dict[tuple, Any] = {}
+_PINECONE_INDEXES: dict[tuple, Any] = {}
+_PINECONE_LOCK = threading.Lock()
+
+
+def _pinecone_index(
+    index_name: str,
+    api_key: str,
+    environment: Optional[str],
+    pool_threads: Optional[int],
+    connection_pool_maxsize: Optional[int]
+):
+    """Return the shared (client, index) pair for these settings."""
+    from pinecone import Pinecone
+
+    client_key = (api_key, environment, pool_threads)
+    index_key = (client_key, index_name, connection_pool_maxsize)
+    with _PINECONE_LOCK:
+        pc = _PINECONE_CLIENTS.get(client_key)
+        if pc is None:
+            kwargs = {"pool_threads": pool_threads} if pool_threads else {}
+            pc = _PINECONE_CLIENTS[client_key] = Pinecone(api_key=api_key, **kwargs)
+        index = _PINECONE_INDEXES.get(index_key)
+        if index is None:
+            kwargs = {}
+            if pool_threads:
+                kwargs["pool_threads"] = pool_threads
+            if connection_pool_maxsize:
+                kwargs["connection_pool_maxsize"] = connection_pool_maxsize
+            index = _PINECONE_INDEXES[index_key] = pc.Index(index_name, **kwargs)
+    return pc, index
 
 
 class PineconeRetriever(Retriever):
     """
     Pinecone vector database retriever.
 
+    Writes are buffered and sent as batched upserts of up to batch_size
+    vectors, amortising one HTTPS round-trip over many chunks. Pending
+    writes are flushed before every search or delete; call flush() (or
+    use the retriever as a context manager) at the end of an ingest.
+
+    cache_size > 0 keeps an LRU cache of recent search results. It is
+    cleared on this instance's writes only, so set cache_ttl when other
+    processes write to the same index.
+
+    Retrievers created with the same credentials share one client and
+    index handle. pool_threads and connection_pool_maxsize size that
+    shared handle's thread and HTTP connection pools.
+
+    normalize=True L2-normalizes vectors and queries client-side, so an
+    index created with the cheaper "dotproduct" metric ranks by cosine.
+
     AGENT_ZONE: Configure for your Pinecone index
     """
 
-    def __init__(self, index_name: str, api_key: str, environment: str = None):
-        from pinecone import Pinecone
-
-        self.pc = Pinecone(api_key=api_key)
-        self.index = self.pc.Index(index_name)
+    def __init__(
+        self,
+        index_name: str,
+        api_key: str,
+        environment: str = None,
+        batch_size: int = 100,
+        cache_size: int = 0,
+        cache_ttl: Optional[float] = None,
+        pool_threads: Optional[int] = None,
+        connection_pool_maxsize: Optional[int] = None,
+        normalize: bool = False
+    ):
+        if normalize and np is None:
+            raise ImportError("PineconeRetriever(normalize=True) requires numpy: pip install numpy")
+        self.normalize = normalize
+        self.pc, self._index = _pinecone_index(
+            index_name, api_key, environment, pool_threads, connection_pool_maxsize
+        )
+        # Pinecone recommends at most 100 vectors per upsert request
+        self.batch_size = batch_size
+        self._buffer: list[dict] = []
+        self._cache = _QueryCache(cache_size, cache_ttl) if cache_size else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def _unit(self, embedding: list[float]) -> list[float]:
+        if not self.normalize:
+            return embedding
+        return normalize_inplace(np.array(embedding, dtype=np.float32)).tolist()
+
+    def _to_vector(self, chunk: Chunk, embedding: list[float]) -> dict:
+        return {
+            "id": chunk.id,
+            "values": self._unit(embedding),
+            "metadata": {
+                "text": chunk.text,
+                "document_id": chunk.document_id,
+                **chunk.metadata
+            }
+        }
 
     def index(self, chunk: Chunk, embedding: list[float]) -> None:
-        self.index.upsert(vectors=[
-            {
-                "id": chunk.id,
-                "values": embedding,
-                "metadata": {
-                    "text": chunk.text,
-                    "document_id": chunk.document_id,
-                    **chunk.metadata
-                }
-            }
-        ])
+        self._buffer.append(self._to_vector(chunk, embedding))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def index_batch(self, chunks: list[Chunk], embeddings: list[list[float]]) -> None:
+        self._buffer.extend(map(self._to_vector, chunks, embeddings))
+        self.flush()
+
+    def flush(self) -> None:
+        """Send all buffered vectors to Pinecone."""
+        if self._buffer and self._cache is not None:
+            self._cache.clear()
+        while self._buffer:
+            batch = self._buffer[:self.batch_size]
+            self._index.upsert(vectors=batch)
+            # Drop only what was sent, so a failed upsert can be retried
+            del self._buffer[:len(batch)]
 
     def search(
         self,
@@ -209,13 +999,34 @@ class PineconeRetriever(Retriever):
         top_k: int = 5,
         filters: Optional[dict] = None
     ) -> list[SearchResult]:
-        results = self.index.query(
-            vector=query_embedding,
+        self.flush()
+        key = None
+        if self._cache is not None:
+            key = _query_cache_key(query_embedding, top_k, filters)
+            cached = self._cache.get(key) if key is not None else None
+            if cached is not None:
+                return list(cached)
+
+        results = self._query(query_embedding, top_k, filters)
+        if key is not None:
+            self._cache.put(key, results)
+        return list(results)
+
+    def _query(
+        self,
+        query_embedding: list[float],
+        top_k: int,
+        filters: Optional[dict]
+    ) -> list[SearchResult]:
+        results = self._index.query(
+            vector=self._unit(query_embedding),
             top_k=top_k,
             filter=filters,
             include_metadata=True
         )
 
+        # The response's metadata dict is handed to each Chunk as-is,
+        # not copied
         return [
             SearchResult(
                 chunk=Chunk(
@@ -230,14 +1041,63 @@ class PineconeRetriever(Retriever):
             for i, match in enumerate(results.matches)
         ]
 
+    def search_ids_only(
+        self,
+        query_embedding: list[float],
+        top_k: int = 5,
+        filters: Optional[dict] = None
+    ) -> list[tuple[str, float]]:
+        """
+        Search returning (chunk_id, score) pairs only.
+
+        Skips fetching metadata and building Chunk objects, for callers
+        that resolve chunk text elsewhere (e.g. rerank pipelines with a
+        document store).
+        """
+        self.flush()
+        results = self._index.query(
+            vector=self._unit(query_embedding),
+            top_k=top_k,
+            filter=filters,
+            include_metadata=False
+        )
+        return [(match.id, match.score) for match in results.matches]
+
     def delete(self, chunk_id: str) -> None:
-        self.index.delete(ids=[chunk_id])
+        self.flush()
+        if self._cache is not None:
+            self._cache.clear()
+        self._index.delete(ids=[chunk_id])
+
+
+def _texts_digest(texts) -> bytes:
+    """Short digest of a sequence of texts, for cache keys."""
+    h = hashlib.blake2s(digest_size=16)
+    for text in texts:
+        data = text.encode()
+        # Length prefix keeps ("ab", "c") and ("a", "bc") apart
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.digest()
 
 
 class RerankedRetriever(Retriever):
     """
     Wrapper that adds reranking to any retriever.
 
+    If batch_size is set and the reranker implements
+    rerank_batch(query, documents, batch_size) -> list[float] (one score
+    per document, in input order), candidates are scored through it.
+    Cross-encoders run much faster on padded batches, and the reranker
+    can encode the query once for all of them.
+
+    Rerank outcomes are cached by query text, the ordered candidate ids
+    and a digest of the candidate texts, so a repeated query (e.g. a
+    streaming UI re-sending as the user types) skips the reranker, while
+    a chunk re-indexed with new text under the same id, even directly
+    into base_retriever, is reranked afresh. cache_size=0 disables the
+    cache; pass no_cache=True to search() to bypass it for one call.
+
     AGENT_ZONE: Configure reranking model
     See: 04-retrieval/reranking.md
     """
@@ -246,21 +1106,35 @@ class RerankedRetriever(Retriever):
         self,
         base_retriever: Retriever,
         reranker,  # Reranker interface
-        initial_k_multiplier: int = 5
+        initial_k_multiplier: int = 5,
+        batch_size: Optional[int] = None,
+        cache_size: int = 512,
+        cache_ttl: Optional[float] = None
     ):
         self.base_retriever = base_retriever
         self.reranker = reranker
         self.k_multiplier = initial_k_multiplier
+        self.batch_size = batch_size
+        self._cache = _QueryCache(cache_size, cache_ttl) if cache_size else None
 
     def index(self, chunk: Chunk, embedding: list[float]) -> None:
+        # A re-indexed chunk may keep its id but change its text
+        if self._cache is not None:
+            self._cache.clear()
         self.base_retriever.index(chunk, embedding)
 
+    def index_batch(self, chunks: list[Chunk], embeddings: list[list[float]]) -> None:
+        if self._cache is not None:
+            self._cache.clear()
+        self.base_retriever.index_batch(chunks, embeddings)
+
     def search(
         self,
         query_embedding: list[float],
         top_k: int = 5,
         filters: Optional[dict] = None,
-        query_text: str = None
+        query_text: str = None,
+        no_cache: bool = False
     ) -> list[SearchResult]:
         # Get more candidates for reranking
         candidates = self.base_retriever.search(
@@ -272,23 +1146,159 @@ class RerankedRetriever(Retriever):
         if not query_text or not candidates:
             return candidates[:top_k]
 
-        # Rerank
-        reranked = self.reranker.rerank(
-            query=query_text,
-            documents=[c.chunk.text for c in candidates],
-            top_k=top_k
-        )
+        key = None
+        if self._cache is not None and not no_cache:
+            key = (
+                hashlib.blake2s(query_text.encode(), digest_size=8).digest(),
+                top_k,
+                tuple(c.chunk.id for c in candidates),
+                _texts_digest(c.chunk.text for c in candidates)
+            )
+            picked = self._cache.get(key)
+            if picked is not None:
+                return self._results(candidates, picked)
 
+        picked = self._rerank(query_text, candidates, top_k)
+        if key is not None:
+            self._cache.put(key, picked)
+        return self._results(candidates, picked)
+
+    def _rerank(
+        self,
+        query_text: str,
+        candidates: list[SearchResult],
+        top_k: int
+    ) -> list[tuple[int, float]]:
+        """Run the reranker; returns (candidate index, score) best first."""
+        documents = [c.chunk.text for c in candidates]
+
+        if self.batch_size and hasattr(self.reranker, "rerank_batch"):
+            scores = self.reranker.rerank_batch(
+                query=query_text,
+                documents=documents,
+                batch_size=self.batch_size
+            )
+            best = heapq.nlargest(top_k, range(len(scores)), key=scores.__getitem__)
+            return [(i, float(scores[i])) for i in best]
+        else:
+            # Rerank
+            reranked = self.reranker.rerank(
+                query=query_text,
+                documents=documents,
+                top_k=top_k
+            )
+            return [(r.index, r.score) for r in reranked]
+
+    @staticmethod
+    def _results(
+        candidates: list[SearchResult],
+        picked: list[tuple[int, float]]
+    ) -> list[SearchResult]:
+        # Only the top_k winners are materialised; each is one O(1)
+        # list index into the candidates
         return [
             SearchResult(
-                chunk=candidates[r.index].chunk,
-                score=r.score,
-                rank=i + 1
+                chunk=candidates[i].chunk,
+                score=score,
+                rank=rank + 1
             )
-            for i, r in enumerate(reranked)
+            for rank, (i, score) in enumerate(picked)
         ]
 
 
+class DefaultHybridRetriever(HybridRetriever):
+    """
+    Hybrid retriever fusing a vector retriever with a keyword index.
+
+    Each backend is queried once, for a candidate pool sized by its
+    weight: ceil(alpha * top_k * candidate_multiplier) vector hits and
+    the (1 - alpha) share of keyword hits. Scores are min-max normalised
+    per pool and combined over the union of the two pools only; a chunk
+    found by one backend scores 0 for the other.
+
+    keyword_retriever is any object exposing index(chunk) and
+    search(query, top_k, filters) -> list[SearchResult], e.g. a BM25 index.
+
+    AGENT_ZONE: Tune alpha and candidate_multiplier on your golden set
+    See: 04-retrieval/hybrid-search.md
+    """
+
+    def __init__(
+        self,
+        vector_retriever: Retriever,
+        keyword_retriever,  # Keyword index (BM25 or similar)
+        candidate_multiplier: int = 2
+    ):
+        self.vector_retriever = vector_retriever
+        self.keyword_retriever = keyword_retriever
+        self.candidate_multiplier = candidate_multiplier
+
+    def index(self, chunk: Chunk, embedding: list[float]) -> None:
+        self.vector_retriever.index(chunk, embedding)
+        self.keyword_retriever.index(chunk)
+
+    def search(
+        self,
+        query_embedding: list[float],
+        top_k: int = 5,
+        filters: Optional[dict] = None
+    ) -> list[SearchResult]:
+        return self.vector_retriever.search(query_embedding, top_k, filters)
+
+    def search_hybrid(
+        self,
+        query: str,
+        query_embedding: list[float],
+        top_k: int = 5,
+        alpha: float = 0.5,
+        filters: Optional[dict] = None
+    ) -> list[SearchResult]:
+        pool = top_k * self.candidate_multiplier
+        # Round off float error before the ceiling (0.3 * 10 is
+        # 3.0000000000000004), and give keywords the remainder so the
+        # two pools never add up to more than pool
+        k_vector = math.ceil(round(alpha * pool, 9))
+        k_keyword = pool - k_vector
+
+        vector_hits = (
+            self.vector_retriever.search(query_embedding, k_vector, filters)
+            if k_vector > 0 else []
+        )
+        keyword_hits = (
+            self.keyword_retriever.search(query, k_keyword, filters)
+            if k_keyword > 0 else []
+        )
+
+        chunks: dict[str, Chunk] = {}
+        combined: dict[str, float] = {}
+        for weight, hits in ((alpha, vector_hits), (1 - alpha, keyword_hits)):
+            for hit, score in zip(hits, _min_max([h.score for h in hits])):
+                chunk_id = hit.chunk.id
+                chunks.setdefault(chunk_id, hit.chunk)
+                combined[chunk_id] = combined.get(chunk_id, 0.0) + weight * score
+
+        best = heapq.nlargest(top_k, combined.items(), key=lambda item: item[1])
+
+        return [
+            SearchResult(chunk=chunks[chunk_id], score=score, rank=i + 1)
+            for i, (chunk_id, score) in enumerate(best)
+        ]
+
+    def delete(self, chunk_id: str) -> None:
+        self.vector_retriever.delete(chunk_id)
+        self.keyword_retriever.delete(chunk_id)
+
+
+def _min_max(scores: list[float]) -> list[float]:
+    """Rescale scores to [0, 1]; a pool of equal scores maps to 1."""
+    if not scores:
+        return []
+    low, high = min(scores), max(scores)
+    if high == low:
+        return [1.0] * len(scores)
+    return [(score - low) / (high - low) for score in scores]
+
+
 # =============================================================================
 # Production Considerations
 # =============================================================================